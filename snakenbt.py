@@ -25,12 +25,14 @@ freely, subject to the following restrictions:
 3. This notice may not be removed or altered from any source distribution.
 """
 
+import array
 import collections.abc
 import io
 import itertools
 import struct
+import sys
 
-from typing import Any, Callable, Generic, TypeVar, Protocol, SupportsIndex, cast
+from typing import Any, Callable, Generic, TypeVar, Protocol, SupportsIndex
 
 
 _TagValue = TypeVar("_TagValue")
@@ -42,6 +44,8 @@ class Tag(Generic[_TagValue]):
     def __init__(self, value: _TagValue, name: str | None = None):
         self._nbt_name = name
         self._nbt_value = value
+        # Encoded tag id and name, filled by the encoder
+        self._nbt_header: bytes | None = None
 
     @property
     def tag_name(self):
@@ -49,7 +53,9 @@ class Tag(Generic[_TagValue]):
 
     @tag_name.setter
     def tag_name(self, name: str | None):
-        self._nbt_name = name
+        if name != self._nbt_name:
+            self._nbt_name = name
+            self._nbt_header = None
         return name
 
     @property
@@ -134,50 +140,88 @@ class TagDouble(TagFloating):
     tag_id: int = 6
 
 
-class _TagListPrimitive(Tag[list[_TagValue]], list[_TagValue]):
-    def __init__(
-        self,
-        cls: type[_TagValue],
-        value: collections.abc.Iterable[_TagValue] | None = None,
-        name: str | None = None,
-    ):
+class _TagListInts(Tag[array.array], collections.abc.MutableSequence[int]):
+    _integer_size: int = 0
+    _typecode: str = ""
+
+    def __init__(self, value: collections.abc.Iterable[int] | None = None, name: str | None = None):
+        super().__init__(self._to_array(value), name)
+
+    def _to_array(self, value: collections.abc.Iterable[int] | None):
         if value is None:
-            list.__init__(self)
+            return array.array(self._typecode)
+        elif isinstance(value, array.array) and value.typecode == self._typecode:
+            # Same item type, copied without going through Python integers
+            return array.array(self._typecode, value)
+        elif isinstance(value, (bytes, bytearray, memoryview)) and self._integer_size == 1:
+            result = array.array(self._typecode)
+            result.frombytes(value)
+            return result
         else:
-            list.__init__(self, value)
-        Tag.__init__(self, self, name)
-        self._nbt_target_type = cls
+            return array.array(self._typecode, (_fix_integer_value(int(v), self._integer_size) for v in value))
 
     @property
-    def tag_value(self):
-        return self
+    def tag_value(self) -> array.array:
+        return self._nbt_value
 
     @tag_value.setter
-    def tag_value(self, value: list[Tag[_TagValue]]):
-        # immutable
-        return self
+    def tag_value(self, value: collections.abc.Iterable[int]):
+        self._nbt_value = self._to_array(value)
 
     @property
     def tag_type(self):
-        return self._nbt_target_type
+        return int
 
-    def append(self, value: _TagValue):
-        if not isinstance(value, self._nbt_target_type):
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._nbt_value.tolist()!r})"
+
+    def __len__(self):
+        return len(self._nbt_value)
+
+    def __iter__(self):
+        return iter(self._nbt_value)
+
+    def __contains__(self, value: object):
+        return value in self._nbt_value
+
+    def __getitem__(self, index: SupportsIndex | slice):
+        return self._nbt_value[index]
+
+    def __setitem__(self, index: SupportsIndex | slice, value: Any):
+        if isinstance(index, slice):
+            self._nbt_value[index] = self._to_array(value)
+        else:
+            self._nbt_value[index] = _fix_integer_value(int(value), self._integer_size)
+
+    def __delitem__(self, index: SupportsIndex | slice):
+        del self._nbt_value[index]
+
+    def __eq__(self, other: object):
+        if isinstance(other, _TagListInts):
+            return self._nbt_value == other._nbt_value
+        elif isinstance(other, array.array):
+            return self._nbt_value == other
+        elif isinstance(other, list):
+            return self._nbt_value.tolist() == other
+        return NotImplemented
+
+    def insert(self, index: SupportsIndex, value: int):
+        if not isinstance(value, int):
             raise ValueError("invalid value type")
 
-        return super().append(value)
+        self._nbt_value.insert(index, _fix_integer_value(value, self._integer_size))
 
+    def append(self, value: int):
+        if not isinstance(value, int):
+            raise ValueError("invalid value type")
 
-class _TagListInts(_TagListPrimitive[int]):
-    _integer_size: int = 0
+        self._nbt_value.append(_fix_integer_value(value, self._integer_size))
 
-    def __init__(self, value: collections.abc.Iterable[int] | None = None, name: str | None = None):
-        super().__init__(
-            int, None if value is None else (_fix_integer_value(int(v), self._integer_size) for v in value), name
-        )
+    def extend(self, values: collections.abc.Iterable[int]):
+        self._nbt_value.extend(self._to_array(values))
 
 
-class TagList(_TagListPrimitive[Tag[_TagValue]]):
+class TagList(_TagRepr[list[Tag[_TagValue]]], collections.abc.MutableSequence[Tag[_TagValue]]):
     tag_id: int = 9
 
     def __init__(
@@ -186,15 +230,77 @@ class TagList(_TagListPrimitive[Tag[_TagValue]]):
         name: str | None = None,
         cls: type[Tag[_TagValue]] = Tag,
     ):
-        super().__init__(cls, value, name)
+        super().__init__([] if value is None else list(value), name)
+        self._nbt_target_type = cls
+
+    @property
+    def tag_value(self) -> list[Tag[_TagValue]]:
+        return self._nbt_value
+
+    @tag_value.setter
+    def tag_value(self, value: collections.abc.Iterable[Tag[_TagValue]]):
+        value = list(value)
+        if not all(isinstance(v, self._nbt_target_type) for v in value):
+            raise ValueError("invalid value type")
+
+        self._nbt_value = value
+
+    @property
+    def tag_type(self):
+        return self._nbt_target_type
+
+    def __len__(self):
+        return len(self._nbt_value)
+
+    def __iter__(self):
+        return iter(self._nbt_value)
+
+    def __contains__(self, value: object):
+        return value in self._nbt_value
+
+    def __getitem__(self, index: SupportsIndex | slice):
+        return self._nbt_value[index]
+
+    def __setitem__(self, index: SupportsIndex | slice, value: Any):
+        if isinstance(index, slice):
+            value = list(value)
+            if not all(isinstance(v, self._nbt_target_type) for v in value):
+                raise ValueError("invalid value type")
+        elif not isinstance(value, self._nbt_target_type):
+            raise ValueError("invalid value type")
+
+        self._nbt_value[index] = value
+
+    def __delitem__(self, index: SupportsIndex | slice):
+        del self._nbt_value[index]
+
+    def __eq__(self, other: object):
+        if isinstance(other, TagList):
+            return self._nbt_value == other._nbt_value
+        elif isinstance(other, list):
+            return self._nbt_value == other
+        return NotImplemented
+
+    def insert(self, index: SupportsIndex, value: Tag[_TagValue]):
+        if not isinstance(value, self._nbt_target_type):
+            raise ValueError("invalid value type")
+
+        self._nbt_value.insert(index, value)
+
+    def append(self, value: Tag[_TagValue]):
+        if not isinstance(value, self._nbt_target_type):
+            raise ValueError("invalid value type")
+
+        self._nbt_value.append(value)
 
 
 class TagByteArray(_TagListInts):
     tag_id: int = 7
     _integer_size: int = 1
+    _typecode: str = "b"
 
     def __bytes__(self):
-        return bytes([v & 0xFF for v in self])
+        return self._nbt_value.tobytes()
 
 
 class TagString(Tag[str], str):
@@ -218,44 +324,93 @@ class TagString(Tag[str], str):
         return self
 
 
-class TagCompound(Tag[dict[str, Tag[Any]]], dict[str, Tag[Any]]):
+class TagCompound(_TagRepr[dict[str, Tag[Any]]], collections.abc.MutableMapping[str, Tag[Any]]):
     tag_id: int = 10
 
-    def __init__(self, value: dict[str, Tag[Any]] | None = None, name: str | None = None):
+    def __init__(self, value: collections.abc.Mapping[str, Tag[Any]] | None = None, name: str | None = None):
+        super().__init__({}, name)
         if value:
-            dict.__init__(self, value)
-        else:
-            dict.__init__(self)
-        Tag.__init__(self, self, name)
-
-        for k, v in self.items():
-            v.tag_name = k
+            self.tag_value = value
 
     @property
-    def tag_value(self):
-        return self
+    def tag_value(self) -> dict[str, Tag[Any]]:
+        return self._nbt_value
 
     @tag_value.setter
-    def tag_value(self, value: dict[str, Tag[Any]]):
-        # immutable
-        return self
+    def tag_value(self, value: collections.abc.Mapping[str, Tag[Any]]):
+        self._nbt_value = dict(value)
+
+        for k, v in self._nbt_value.items():
+            v.tag_name = k
+
+    def __len__(self):
+        return len(self._nbt_value)
+
+    def __iter__(self):
+        return iter(self._nbt_value)
+
+    def __contains__(self, key: object):
+        return key in self._nbt_value
+
+    def __getitem__(self, key: str):
+        return self._nbt_value[key]
 
     def __setitem__(self, key: str, item: Tag[Any]) -> None:
         if not isinstance(item, Tag):
             raise ValueError("invalid value type")
 
-        super().__setitem__(key, item)
+        self._nbt_value[key] = item
         item.tag_name = key
 
+    def __delitem__(self, key: str):
+        del self._nbt_value[key]
+
+    def __eq__(self, other: object):
+        if isinstance(other, TagCompound):
+            return self._nbt_value == other._nbt_value
+        elif isinstance(other, dict):
+            return self._nbt_value == other
+        return NotImplemented
+
+    def get(self, key: str, default: Any = None):
+        return self._nbt_value.get(key, default)
+
+    def keys(self):
+        return self._nbt_value.keys()
+
+    def values(self):
+        return self._nbt_value.values()
+
+    def items(self):
+        return self._nbt_value.items()
+
 
 class TagIntArray(_TagListInts):
     tag_id: int = 11
     _integer_size: int = 4
+    _typecode: str = "i"
 
 
 class TagLongArray(_TagListInts):
     tag_id: int = 12
     _integer_size: int = 8
+    _typecode: str = "q"
+
+
+# Tag ids bound once so hot code does not go through class attribute lookups
+_TID_END = TagEnd.tag_id
+_TID_BYTE = TagByte.tag_id
+_TID_SHORT = TagShort.tag_id
+_TID_INT = TagInt.tag_id
+_TID_LONG = TagLong.tag_id
+_TID_FLOAT = TagFloat.tag_id
+_TID_DOUBLE = TagDouble.tag_id
+_TID_BYTE_ARRAY = TagByteArray.tag_id
+_TID_STRING = TagString.tag_id
+_TID_LIST = TagList.tag_id
+_TID_COMPOUND = TagCompound.tag_id
+_TID_INT_ARRAY = TagIntArray.tag_id
+_TID_LONG_ARRAY = TagLongArray.tag_id
 
 
 def _make_factory_2(cls: type[Tag[Any]]):
@@ -296,6 +451,9 @@ _ALL_TAGS_MINUS_TAG_LIST: tuple[type[Tag[Any]], ...] = (
 )
 
 _TAG_ID_MAPPING = {cls.tag_id: cls for cls in _ALL_TAGS}
+# Single byte encoding of each tag id, indexed by tag id
+_TID_BYTES: tuple[bytes, ...] = tuple(bytes((tag_id,)) for tag_id in range(len(_ALL_TAGS)))
+_TID_END_BYTE = _TID_BYTES[_TID_END]
 
 _DECODER_BY_TAG_TYPE: dict[int, Callable[[Any, str | None, Any], Any]] = dict(
     itertools.chain(
@@ -313,6 +471,10 @@ def _convert_bytearray(value: bytes, name: str | None, other_data: Any | None):
     return list(value)
 
 
+def _convert_array(value: array.array, name: str | None, other_data: Any | None):
+    return value.tolist()
+
+
 _DECODER_DUMMY_TYPE: dict[int, Callable[[Any, str | None, Any | None], Any]] = {
     TagEnd.tag_id: _convert_dummy,
     TagByte.tag_id: _convert_dummy,
@@ -325,8 +487,8 @@ _DECODER_DUMMY_TYPE: dict[int, Callable[[Any, str | None, Any | None], Any]] = {
     TagString.tag_id: _convert_dummy,
     TagList.tag_id: _convert_dummy,
     TagCompound.tag_id: _convert_dummy,
-    TagIntArray.tag_id: _convert_dummy,
-    TagLongArray.tag_id: _convert_dummy,
+    TagIntArray.tag_id: _convert_array,
+    TagLongArray.tag_id: _convert_array,
 }
 
 
@@ -342,8 +504,8 @@ _DECODER_DUMMY_BYTEARRAY_AS_LIST_TYPE: dict[int, Callable[[Any, str | None, Any
     TagString.tag_id: _convert_dummy,
     TagList.tag_id: _convert_dummy,
     TagCompound.tag_id: _convert_dummy,
-    TagIntArray.tag_id: _convert_dummy,
-    TagLongArray.tag_id: _convert_dummy,
+    TagIntArray.tag_id: _convert_array,
+    TagLongArray.tag_id: _convert_array,
 }
 
 
@@ -357,329 +519,653 @@ class _SupportsByteWrite(Protocol):
         ...
 
 
-def _from_java_utf8(data: bytes):
-    return str(data.replace(b"\xC0\x80", b"\0"), "utf-8")
+# Encoders take the bound write method (file.write or bytearray.extend) rather than the file object.
+_ByteWriter = Callable[[bytes], Any]
+
+
+_S_BYTE = struct.Struct(">b")
+_S_SHORT = struct.Struct(">h")
+_S_INT = struct.Struct(">i")
+_S_LONG = struct.Struct(">q")
+_S_FLOAT = struct.Struct(">f")
+_S_DOUBLE = struct.Struct(">d")
+_S_USHORT = struct.Struct(">H")
+_S_UINT = struct.Struct(">I")
+_S_LIST_HEADER = struct.Struct(">BI")
+_S_HEADER = struct.Struct(">BH")
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _from_java_utf8(data: bytes | memoryview):
+    try:
+        # 0xC0 never occurs in standard UTF-8, so only data with an encoded NUL (or invalid data) fails here.
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        return str(bytes(data).replace(b"\xC0\x80", b"\0"), "utf-8")
 
 
 def _to_java_utf8(data: str):
-    return data.encode("utf-8").replace(b"\0", b"\xC0\x80")
+    if "\0" not in data:
+        return data.encode()
+    return data.encode().replace(b"\0", b"\xC0\x80")
 
 
 def _read_vlstring(fp: _SupportsByteRead):
-    length: int = struct.unpack(">H", fp.read(2))[0]
+    length: int = _S_USHORT.unpack(fp.read(2))[0]
     return _from_java_utf8(fp.read(length))
 
 
-def _write_vlstring(fp: _SupportsByteWrite, string: str):
+def _to_vlstring_data(string: str):
     bytestr = _to_java_utf8(string)
-    length = len(bytestr)
 
-    if length > 65535:
+    if len(bytestr) > 65535:
         raise ValueError(f"string {string[:35]} too long to encode")
 
-    fp.write(length.to_bytes(2, "big"))
-    fp.write(bytestr)
+    return bytestr
 
 
-def _decode_python_by_tag_id(
-    fp: _SupportsByteRead,
-    tag_id: int,
-    convert_map: dict[int, Callable[[Any, str | None, Any | None], Any]],
-    name: str | None,
-):
-    other_data = None
-    length: int
-    python_data: int | bytes | str | list[Any] | dict[str, Any] | None
-    match tag_id:
-        case TagByte.tag_id:
-            python_data = fp.read(1)[0]
-        case TagShort.tag_id:
-            python_data = struct.unpack(">h", fp.read(2))[0]
-        case TagInt.tag_id:
-            python_data = struct.unpack(">i", fp.read(4))[0]
-        case TagLong.tag_id:
-            python_data = struct.unpack(">q", fp.read(8))[0]
-        case TagFloat.tag_id:
-            python_data = struct.unpack(">f", fp.read(4))[0]
-        case TagDouble.tag_id:
-            python_data = struct.unpack(">d", fp.read(8))[0]
-        case TagByteArray.tag_id:
-            length = struct.unpack(">I", fp.read(4))[0]
-            python_data = fp.read(length)
-        case TagString.tag_id:
-            python_data = _read_vlstring(fp)
-        case TagList.tag_id:
-            target_tag_id = fp.read(1)[0]
-            length = struct.unpack(">I", fp.read(4))[0]
-            python_data = []
-            for _ in range(length):
-                python_data.append(_decode_python_by_tag_id(fp, target_tag_id, convert_map, None))
-            other_data = _TAG_ID_MAPPING[target_tag_id]
-        case TagCompound.tag_id:
-            python_data = {}
-
-            while True:
-                decoded_object, decoded_name = _decode(fp, convert_map, True)
-                if decoded_object is None:
-                    # TAG_End
-                    break
-
-                assert decoded_name is not None
-                python_data[decoded_name] = decoded_object
-        case TagIntArray.tag_id:
-            length = struct.unpack(">I", fp.read(4))[0]
-            python_data = []
-            for _ in range(length):
-                python_data.append(_decode_python_by_tag_id(fp, TagInt.tag_id, convert_map, None))
-        case TagLongArray.tag_id:
-            length = struct.unpack(">I", fp.read(4))[0]
-            python_data = []
-            for _ in range(length):
-                python_data.append(_decode_python_by_tag_id(fp, TagLong.tag_id, convert_map, None))
-        case _:
-            python_data = None
-
-    return convert_map[tag_id](python_data, name, other_data)
-
-
-def _decode(
-    fp: _SupportsByteRead, convert_map: dict[int, Callable[[Any, str | None, Any | None], Any]], decode_name: bool
-):
+def _write_vlstring(write: _ByteWriter, string: str):
+    bytestr = _to_vlstring_data(string)
+    write(_S_USHORT.pack(len(bytestr)) + bytestr)
+
+
+def _encode_header(tag_id: int, name: str | None):
+    if name is None:
+        return _TID_BYTES[tag_id]
+
+    bytestr = _to_vlstring_data(name)
+    return _S_HEADER.pack(tag_id, len(bytestr)) + bytestr
+
+
+def _write_header(write: _ByteWriter, tag_id: int, name: str | None, write_tag_id: bool):
+    # Tag id and name go out in a single write
+    if write_tag_id:
+        write(_encode_header(tag_id, name))
+    elif name is not None:
+        _write_vlstring(write, name)
+
+
+def _pack_array(typecode: str, values: collections.abc.Iterable[int | float]):
+    arr = array.array(typecode, values)
+    if _NATIVE_LITTLE_ENDIAN:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpack_array(typecode: str, data: bytes | memoryview, length: int):
+    arr = array.array(typecode)
+    if len(data) != length * arr.itemsize:
+        # Truncated input, report it the same way the struct-based decoders do
+        raise struct.error(f"unpack requires a buffer of {length * arr.itemsize} bytes")
+    arr.frombytes(data)
+    if _NATIVE_LITTLE_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+_ConvertMap = dict[int, Callable[[Any, str | None, Any | None], Any]]
+
+# array typecode and item size for TAG_List members which can be decoded in bulk.
+# TAG_Byte is kept unsigned to match _decode_byte.
+_LIST_ARRAY_FORMAT: dict[int, tuple[str, int]] = {
+    TagByte.tag_id: ("B", 1),
+    TagShort.tag_id: ("h", 2),
+    TagInt.tag_id: ("i", 4),
+    TagLong.tag_id: ("q", 8),
+    TagFloat.tag_id: ("f", 4),
+    TagDouble.tag_id: ("d", 8),
+}
+
+
+def _convert_list_array(values: list[Any], target_tag_id: int, convert_map: _ConvertMap):
+    convert = convert_map[target_tag_id]
+    if convert is _convert_dummy:
+        return values
+    return [convert(v, None, None) for v in values]
+
+
+def _decode_end(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](None, name, None)
+
+
+def _decode_byte(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](fp.read(1)[0], name, None)
+
+
+def _decode_short(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_SHORT.unpack(fp.read(2))[0], name, None)
+
+
+def _decode_int(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_INT.unpack(fp.read(4))[0], name, None)
+
+
+def _decode_long(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_LONG.unpack(fp.read(8))[0], name, None)
+
+
+def _decode_float(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_FLOAT.unpack(fp.read(4))[0], name, None)
+
+
+def _decode_double(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_DOUBLE.unpack(fp.read(8))[0], name, None)
+
+
+def _decode_byte_array(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack(fp.read(4))[0]
+    return convert_map[tag_id](fp.read(length), name, None)
+
+
+def _decode_string(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_read_vlstring(fp), name, None)
+
+
+def _decode_list(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    target_tag_id = fp.read(1)[0]
+    length: int = _S_UINT.unpack(fp.read(4))[0]
+    list_format = _LIST_ARRAY_FORMAT.get(target_tag_id)
+    if list_format is None:
+        decoder = _PAYLOAD_DECODERS[target_tag_id]
+        python_data = [decoder(fp, target_tag_id, convert_map, None) for _ in range(length)]
+    else:
+        typecode, itemsize = list_format
+        values = _unpack_array(typecode, fp.read(length * itemsize), length).tolist()
+        python_data = _convert_list_array(values, target_tag_id, convert_map)
+    return convert_map[tag_id](python_data, name, _TAG_ID_MAPPING[target_tag_id])
+
+
+def _decode_compound(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    python_data: dict[str, Any] = {}
+
+    while True:
+        child_tag_id = fp.read(1)[0]
+        if child_tag_id == 0:
+            # TAG_End
+            break
+
+        child_name = _read_vlstring(fp)
+        python_data[child_name] = _PAYLOAD_DECODERS[child_tag_id](fp, child_tag_id, convert_map, child_name)
+
+    return convert_map[tag_id](python_data, name, None)
+
+
+def _decode_int_array(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack(fp.read(4))[0]
+    return convert_map[tag_id](_unpack_array("i", fp.read(length * 4), length), name, None)
+
+
+def _decode_long_array(fp: _SupportsByteRead, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack(fp.read(4))[0]
+    return convert_map[tag_id](_unpack_array("q", fp.read(length * 8), length), name, None)
+
+
+_PAYLOAD_DECODERS: dict[int, Callable[[_SupportsByteRead, int, _ConvertMap, str | None], Any]] = {
+    TagEnd.tag_id: _decode_end,
+    TagByte.tag_id: _decode_byte,
+    TagShort.tag_id: _decode_short,
+    TagInt.tag_id: _decode_int,
+    TagLong.tag_id: _decode_long,
+    TagFloat.tag_id: _decode_float,
+    TagDouble.tag_id: _decode_double,
+    TagByteArray.tag_id: _decode_byte_array,
+    TagString.tag_id: _decode_string,
+    TagList.tag_id: _decode_list,
+    TagCompound.tag_id: _decode_compound,
+    TagIntArray.tag_id: _decode_int_array,
+    TagLongArray.tag_id: _decode_long_array,
+}
+
+
+def _decode(fp: _SupportsByteRead, convert_map: _ConvertMap, decode_name: bool):
     tag_id = fp.read(1)[0]
     if tag_id == 0:
-        return None, None
+        return None
 
     name = None
     if decode_name:
         name = _read_vlstring(fp)
 
-    return _decode_python_by_tag_id(fp, tag_id, convert_map, name), name
+    return _PAYLOAD_DECODERS[tag_id](fp, tag_id, convert_map, name)
 
 
-def _guess_target_tag_id(data: collections.abc.Sequence[Any], deep: bool = True) -> tuple[int, int]:
-    if isinstance(data, bytes):
-        # TAG_Byte_Array
-        return TagByteArray.tag_id, 0
-
-    last = None
-    target_list_type = 0
-    bitsize = 0
-    for value in data:
-        value_type = type(value)
-        if last is None:
-            last = value_type
-        elif last is not value_type:
-            raise ValueError("cannot inference target tag for list")
-
-        if value_type is int:
-            bitsize = max(cast(int, value).bit_length(), bitsize)
-        elif issubclass(value_type, collections.abc.Sequence) and deep:
-            container_tag_id, _ = _guess_target_tag_id(cast(collections.abc.Sequence, value), False)
-            if target_list_type == 0:
-                target_list_type = container_tag_id
-            elif target_list_type != container_tag_id:
-                raise ValueError("cannot inference target tag for list")
+def _read_vlstring_buffer(data: memoryview, offset: int):
+    length: int = _S_USHORT.unpack_from(data, offset)[0]
+    offset = offset + 2 + length
+    return _from_java_utf8(data[offset - length : offset]), offset
+
+
+def _decode_buffer_end(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](None, name, None), offset
+
+
+def _decode_buffer_byte(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](data[offset], name, None), offset + 1
+
+
+def _decode_buffer_short(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_SHORT.unpack_from(data, offset)[0], name, None), offset + 2
+
+
+def _decode_buffer_int(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_INT.unpack_from(data, offset)[0], name, None), offset + 4
+
+
+def _decode_buffer_long(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_LONG.unpack_from(data, offset)[0], name, None), offset + 8
+
 
-    if last is None:
-        return TagList.tag_id, TagEnd.tag_id
-    elif last is int:
-        # Get highest bit
+def _decode_buffer_float(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_FLOAT.unpack_from(data, offset)[0], name, None), offset + 4
+
+
+def _decode_buffer_double(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    return convert_map[tag_id](_S_DOUBLE.unpack_from(data, offset)[0], name, None), offset + 8
+
+
+def _decode_buffer_byte_array(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack_from(data, offset)[0]
+    offset = offset + 4 + length
+    return convert_map[tag_id](bytes(data[offset - length : offset]), name, None), offset
+
+
+def _decode_buffer_string(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    string, offset = _read_vlstring_buffer(data, offset)
+    return convert_map[tag_id](string, name, None), offset
+
+
+def _decode_buffer_list(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    target_tag_id = data[offset]
+    length: int = _S_UINT.unpack_from(data, offset + 1)[0]
+    offset = offset + 5
+    list_format = _LIST_ARRAY_FORMAT.get(target_tag_id)
+    if list_format is None:
+        decoder = _BUFFER_PAYLOAD_DECODERS[target_tag_id]
+        python_data = []
+        for _ in range(length):
+            decoded_object, offset = decoder(data, offset, target_tag_id, convert_map, None)
+            python_data.append(decoded_object)
+    else:
+        typecode, itemsize = list_format
+        offset = offset + length * itemsize
+        values = _unpack_array(typecode, data[offset - length * itemsize : offset], length).tolist()
+        python_data = _convert_list_array(values, target_tag_id, convert_map)
+    return convert_map[tag_id](python_data, name, _TAG_ID_MAPPING[target_tag_id]), offset
+
+
+def _decode_buffer_compound(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    python_data: dict[str, Any] = {}
+
+    while True:
+        child_tag_id = data[offset]
+        if child_tag_id == 0:
+            # TAG_End
+            offset = offset + 1
+            break
+
+        child_name, offset = _read_vlstring_buffer(data, offset + 1)
+        decoder = _BUFFER_PAYLOAD_DECODERS[child_tag_id]
+        python_data[child_name], offset = decoder(data, offset, child_tag_id, convert_map, child_name)
+
+    return convert_map[tag_id](python_data, name, None), offset
+
+
+def _decode_buffer_int_array(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack_from(data, offset)[0]
+    offset = offset + 4 + length * 4
+    return convert_map[tag_id](_unpack_array("i", data[offset - length * 4 : offset], length), name, None), offset
+
+
+def _decode_buffer_long_array(data: memoryview, offset: int, tag_id: int, convert_map: _ConvertMap, name: str | None):
+    length: int = _S_UINT.unpack_from(data, offset)[0]
+    offset = offset + 4 + length * 8
+    return convert_map[tag_id](_unpack_array("q", data[offset - length * 8 : offset], length), name, None), offset
+
+
+_BUFFER_PAYLOAD_DECODERS: dict[int, Callable[[memoryview, int, int, _ConvertMap, str | None], tuple[Any, int]]] = {
+    TagEnd.tag_id: _decode_buffer_end,
+    TagByte.tag_id: _decode_buffer_byte,
+    TagShort.tag_id: _decode_buffer_short,
+    TagInt.tag_id: _decode_buffer_int,
+    TagLong.tag_id: _decode_buffer_long,
+    TagFloat.tag_id: _decode_buffer_float,
+    TagDouble.tag_id: _decode_buffer_double,
+    TagByteArray.tag_id: _decode_buffer_byte_array,
+    TagString.tag_id: _decode_buffer_string,
+    TagList.tag_id: _decode_buffer_list,
+    TagCompound.tag_id: _decode_buffer_compound,
+    TagIntArray.tag_id: _decode_buffer_int_array,
+    TagLongArray.tag_id: _decode_buffer_long_array,
+}
+
+
+def _decode_buffer(data: memoryview, offset: int, convert_map: _ConvertMap, decode_name: bool):
+    tag_id = data[offset]
+    offset = offset + 1
+    if tag_id == 0:
+        return None, offset
+
+    name = None
+    if decode_name:
+        name, offset = _read_vlstring_buffer(data, offset)
+
+    return _BUFFER_PAYLOAD_DECODERS[tag_id](data, offset, tag_id, convert_map, name)
+
+
+# Binary buffers which are encoded as TAG_Byte_Array directly
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+_GuessMemo = dict[int, tuple[collections.abc.Sequence[Any], tuple[int, int]]]
+
+
+def _guess_target_tag_id(data: collections.abc.Sequence[Any], memo: _GuessMemo) -> tuple[int, int]:
+    if isinstance(data, Tag):
+        # Tag types already determine the answer
+        if isinstance(data, TagList):
+            return _TID_LIST, data.tag_type.tag_id
+        return data.tag_id, 0
+
+    # Nested sequences are inferred while inferring their parent, then looked up again when they're encoded.
+    # The memo keeps a reference to each sequence, so its id cannot be reused by another object while it's in use.
+    key = id(data)
+    cached = memo.get(key)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+
+    result = _infer_target_tag_id(data, memo)
+    memo[key] = (data, result)
+    return result
+
+
+def _infer_target_tag_id(data: collections.abc.Sequence[Any], memo: _GuessMemo) -> tuple[int, int]:
+    if isinstance(data, _BYTES_TYPES):
+        # TAG_Byte_Array
+        return _TID_BYTE_ARRAY, 0
+
+    value_types = set(map(type, data))
+    if not value_types:
+        return _TID_LIST, _TID_END
+    elif len(value_types) > 1:
+        raise ValueError("cannot inference target tag for list")
+
+    (last,) = value_types
+    if last is int:
+        # Signed width: magnitude bits of the widest value (~v for negatives) plus the sign bit
+        low, high = min(data), max(data)
+        if -128 <= low and high < 256:
+            # Byte arrays are decoded as unsigned values, so accept both signed and unsigned bytes
+            return _TID_BYTE_ARRAY, 0
+        bitsize = max(high.bit_length() if high > 0 else 0, (~low).bit_length() if low < 0 else 0) + 1
         if bitsize > 64:
             raise ValueError(f"list of int too large to be encoded")
         elif bitsize > 32:
-            return TagLongArray.tag_id, 0
+            return _TID_LONG_ARRAY, 0
         elif bitsize > 16:
-            return TagIntArray.tag_id, 0
-        elif bitsize > 8:
-            return TagList.tag_id, TagShort.tag_id
+            return _TID_INT_ARRAY, 0
         else:
-            return TagByteArray.tag_id, 0
+            return _TID_LIST, _TID_SHORT
     elif last is float:
-        return TagList.tag_id, TagDouble.tag_id
+        return _TID_LIST, _TID_DOUBLE
     elif issubclass(last, str):
-        return TagList.tag_id, TagString.tag_id
+        return _TID_LIST, _TID_STRING
     elif issubclass(last, collections.abc.Sequence):
-        return TagList.tag_id, target_list_type
+        target_list_type = 0
+        for value in data:
+            container_tag_id, _ = _guess_target_tag_id(value, memo)
+            if target_list_type == 0:
+                target_list_type = container_tag_id
+            elif target_list_type != container_tag_id:
+                raise ValueError("cannot inference target tag for list")
+
+        return _TID_LIST, target_list_type
     elif issubclass(last, collections.abc.Mapping):
-        return TagList.tag_id, TagCompound.tag_id
+        return _TID_LIST, _TID_COMPOUND
 
     raise ValueError("cannot inference target tag for list")
 
 
-def _encode_value_tagged(fp: _SupportsByteWrite, value: Tag[Any], write_tag_id: int):
+def _encode_end(write: _ByteWriter, value: TagEnd):
+    pass
+
+
+def _encode_byte(write: _ByteWriter, value: TagByte):
+    write(_S_BYTE.pack(value.tag_value))
+
+
+def _encode_short(write: _ByteWriter, value: TagShort):
+    write(_S_SHORT.pack(value.tag_value))
+
+
+def _encode_int(write: _ByteWriter, value: TagInt):
+    write(_S_INT.pack(value.tag_value))
+
+
+def _encode_long(write: _ByteWriter, value: TagLong):
+    write(_S_LONG.pack(value.tag_value))
+
+
+def _encode_float(write: _ByteWriter, value: TagFloat):
+    write(_S_FLOAT.pack(value.tag_value))
+
+
+def _encode_double(write: _ByteWriter, value: TagDouble):
+    write(_S_DOUBLE.pack(value.tag_value))
+
+
+def _encode_byte_array(write: _ByteWriter, value: TagByteArray):
+    write(_S_UINT.pack(len(value)))
+    write(value.tag_value.tobytes())
+
+
+def _encode_string(write: _ByteWriter, value: TagString):
+    _write_vlstring(write, value)
+
+
+def _encode_list(write: _ByteWriter, value: TagList[Tag[Any]]):
+    items = value._nbt_value
+    write(_S_LIST_HEADER.pack(value.tag_type.tag_id, len(items)))
+    for v in items:
+        v.tag_name = None
+        _encode_value(write, v, None, False)
+
+
+def _encode_compound(write: _ByteWriter, value: TagCompound):
+    for k, v in value._nbt_value.items():
+        v.tag_name = k
+        _encode_value(write, v, k, True)
+    write(_TID_END_BYTE)
+
+
+def _encode_int_array(write: _ByteWriter, value: TagIntArray):
+    write(_S_UINT.pack(len(value)))
+    write(_pack_array("i", value.tag_value))
+
+
+def _encode_long_array(write: _ByteWriter, value: TagLongArray):
+    write(_S_UINT.pack(len(value)))
+    write(_pack_array("q", value.tag_value))
+
+
+_PAYLOAD_ENCODERS: dict[type[Tag[Any]], Callable[[_ByteWriter, Any], None]] = {
+    TagEnd: _encode_end,
+    TagByte: _encode_byte,
+    TagShort: _encode_short,
+    TagInt: _encode_int,
+    TagLong: _encode_long,
+    TagFloat: _encode_float,
+    TagDouble: _encode_double,
+    TagByteArray: _encode_byte_array,
+    TagString: _encode_string,
+    TagList: _encode_list,
+    TagCompound: _encode_compound,
+    TagIntArray: _encode_int_array,
+    TagLongArray: _encode_long_array,
+}
+
+
+def _resolve_payload_encoder(cls: type[Tag[Any]]):
+    # Other Tag subclasses are encoded like the tag type their tag_id refers to
+    tag_cls = _TAG_ID_MAPPING.get(cls.tag_id)
+    if tag_cls is None:
+        raise TypeError(f"unknown tag id {cls.tag_id:02x} of '{cls.__name__}'")
+
+    encoder = _PAYLOAD_ENCODERS[cls] = _PAYLOAD_ENCODERS[tag_cls]
+    return encoder
+
+
+def _encode_value_tagged(write: _ByteWriter, value: Tag[Any], write_tag_id: int):
+    encoder = _PAYLOAD_ENCODERS.get(type(value))
+    if encoder is None:
+        encoder = _resolve_payload_encoder(type(value))
+
     if write_tag_id:
-        fp.write(value.tag_id.to_bytes(1, "big"))
-    if value.tag_name is not None:
-        _write_vlstring(fp, value.tag_name)
-    typed_value: TagByteArray | TagIntArray | TagLongArray | TagList[Tag[Any]]
-    match value.tag_id:
-        case TagEnd.tag_id:
-            pass
-        case TagByte.tag_id:
-            fp.write(cast(TagByte, value).tag_value.to_bytes(1, "big", signed=True))
-        case TagShort.tag_id:
-            fp.write(cast(TagShort, value).tag_value.to_bytes(2, "big", signed=True))
-        case TagInt.tag_id:
-            fp.write(cast(TagInt, value).tag_value.to_bytes(4, "big", signed=True))
-        case TagLong.tag_id:
-            fp.write(cast(TagLong, value).tag_value.to_bytes(8, "big", signed=True))
-        case TagFloat.tag_id:
-            fp.write(struct.pack(">f", value.tag_value))
-        case TagDouble.tag_id:
-            fp.write(struct.pack(">d", value.tag_value))
-        case TagByteArray.tag_id:
-            typed_value = cast(TagByteArray, value)
-            fp.write(struct.pack(">I", len(typed_value)))
-            fp.write(bytes(typed_value))
-        case TagString.tag_id:
-            _write_vlstring(fp, cast(str, value))
-        case TagList.tag_id:
-            typed_value = cast(TagList[Tag[Any]], value)
-            fp.write(typed_value.tag_type.tag_id.to_bytes(1, "big"))
-            fp.write(struct.pack(">I", len(typed_value)))
-            for v in typed_value:
-                v.tag_name = None
-                _encode_value(fp, v, None, False)
-        case TagCompound.tag_id:
-            for k, v in cast(TagCompound, value).items():
-                v.tag_name = k
-                _encode_value(fp, v, k, True)
-            fp.write(TagEnd.tag_id.to_bytes(1, "big"))
-        case TagIntArray.tag_id:
-            typed_value = cast(TagIntArray, value)
-            fp.write(struct.pack(">I", len(typed_value)))
-            for i in typed_value:
-                fp.write(i.to_bytes(4, "big", signed=True))
-        case TagIntArray.tag_id:
-            typed_value = cast(TagLongArray, value)
-            fp.write(struct.pack(">I", len(typed_value)))
-            for i in typed_value:
-                fp.write(i.to_bytes(8, "big", signed=True))
-        case _:
-            raise TypeError(f"unknown tag id {value.tag_id:02x} of '{value.__class__.__name__}'")
+        header = value._nbt_header
+        if header is None:
+            # Cached on the tag until its name changes
+            header = value._nbt_header = _encode_header(value.tag_id, value._nbt_name)
+        write(header)
+    elif value._nbt_name is not None:
+        _write_vlstring(write, value._nbt_name)
+    encoder(write, value)
+
+
+_INTSIZE_BY_ARRAY_TAG_ID: dict[int, int] = {
+    TagByteArray.tag_id: 1,
+    TagIntArray.tag_id: 4,
+    TagLongArray.tag_id: 8,
+}
+_INTSIZE_BY_TAG_ID: dict[int, int] = {
+    TagByte.tag_id: 1,
+    TagShort.tag_id: 2,
+    TagInt.tag_id: 4,
+    TagLong.tag_id: 8,
+}
 
 
 def _get_intsize_by_tag_id(tag_id: int, for_arrays: bool):
     if for_arrays:
-        match tag_id:
-            case TagByteArray.tag_id:
-                return 1
-            case TagIntArray.tag_id:
-                return 4
-            case TagLongArray.tag_id:
-                return 8
-            case _:
-                raise ValueError(f"Unknown tag id for arrays {tag_id}")
+        intsize = _INTSIZE_BY_ARRAY_TAG_ID.get(tag_id)
+        if intsize is None:
+            raise ValueError(f"Unknown tag id for arrays {tag_id}")
+        return intsize
     else:
-        match tag_id:
-            case TagByte.tag_id:
-                return 1
-            case TagShort.tag_id:
-                return 2
-            case TagInt.tag_id:
-                return 4
-            case TagLong.tag_id:
-                return 8
-            case _:
-                return 0
+        return _INTSIZE_BY_TAG_ID.get(tag_id, 0)
+
+
+# Tag id for each integer size
+_INTEGER_TAG_ID_BY_INTSIZE: dict[int, int] = {
+    1: TagByte.tag_id,
+    2: TagShort.tag_id,
+    4: TagInt.tag_id,
+    8: TagLong.tag_id,
+}
 
 
 def _encode_value_primitive(
-    fp: _SupportsByteWrite, value: Any, name: str | None, write_tag_id: bool, *, intsize: int = 0
+    write: _ByteWriter,
+    value: Any,
+    name: str | None,
+    write_tag_id: bool,
+    *,
+    intsize: int = 0,
+    guess_memo: _GuessMemo | None = None,
 ):
     if isinstance(value, int):
         if intsize == 0:
-            if value in range(-128, 128):
+            if -128 <= value < 128:
                 intsize = 1
-                value = value & 0xFF
-                tag_id = TagByte.tag_id
-            elif value in range(-32768, 32768):
+            elif -32768 <= value < 32768:
                 intsize = 2
-                value = value & 0xFFFF
-                tag_id = TagShort.tag_id
-            elif value in range(-2147483648, 2147483648):
+            elif -2147483648 <= value < 2147483648:
                 intsize = 4
-                value = value & 0xFFFFFFFF
-                tag_id = TagInt.tag_id
-            elif value in range(-9223372036854775808, 9223372036854775808):
+            elif -9223372036854775808 <= value < 9223372036854775808:
                 intsize = 8
-                value = value & 0xFFFFFFFFFFFFFFFF
-                tag_id = TagLong.tag_id
             else:
                 raise ValueError(f"integer '{value}' too large to be encoded")
+        elif intsize > 8:
+            raise ValueError(f"intsize '{intsize}' too large")
+        elif intsize == 1:
+            # Bytes are decoded as unsigned values, so accept both signed and unsigned bytes
+            if not -128 <= value < 256:
+                raise ValueError(f"integer '{value}' too large to be encoded")
         else:
-            if intsize > 8:
-                raise ValueError(f"intsize '{intsize}' too large")
-            elif intsize > 4:
-                tag_id = TagLong.tag_id
-            elif intsize > 2:
-                tag_id = TagInt.tag_id
-            elif intsize > 1:
-                tag_id = TagShort.tag_id
-            else:
-                tag_id = TagByte.tag_id
-        if write_tag_id:
-            fp.write(tag_id.to_bytes(1, "big"))
-        if name is not None:
-            _write_vlstring(fp, name)
-        fp.write(value.to_bytes(intsize, "big"))
+            bound = 1 << (intsize * 8 - 1)
+            if not -bound <= value < bound:
+                raise ValueError(f"integer '{value}' too large to be encoded")
+        _write_header(write, _INTEGER_TAG_ID_BY_INTSIZE[intsize], name, write_tag_id)
+        if intsize == 1:
+            write((value & 0xFF).to_bytes(1, "big"))
+        else:
+            write(value.to_bytes(intsize, "big", signed=True))
     elif isinstance(value, float):
         # Assume double-precision for now
-        if write_tag_id:
-            fp.write(TagDouble.tag_id.to_bytes(1, "big"))
-        if name is not None:
-            _write_vlstring(fp, name)
-        fp.write(struct.pack(">d", value))
+        _write_header(write, _TID_DOUBLE, name, write_tag_id)
+        write(_S_DOUBLE.pack(value))
     elif isinstance(value, str):
-        if write_tag_id:
-            fp.write(TagString.tag_id.to_bytes(1, "big"))
-        if name is not None:
-            _write_vlstring(fp, name)
-        _write_vlstring(fp, value)
+        _write_header(write, _TID_STRING, name, write_tag_id)
+        _write_vlstring(write, value)
+    elif isinstance(value, _BYTES_TYPES):
+        # Raw bytes are TAG_Byte_Array payload as-is
+        if isinstance(value, memoryview):
+            value = value.tobytes()
+        _write_header(write, _TID_BYTE_ARRAY, name, write_tag_id)
+        write(_S_UINT.pack(len(value)))
+        write(value)
     elif isinstance(value, collections.abc.Sequence):
         # List, but list of what?
         arrlen = len(value)
         if arrlen > 0x7FFFFFFF:
             raise ValueError("list too long")
 
-        container_tag_id, target_type_tag_id = _guess_target_tag_id(value, True)
-        if write_tag_id:
-            fp.write(container_tag_id.to_bytes(1, "big"))
-        if name is not None:
-            _write_vlstring(fp, name)
-        if container_tag_id == TagList.tag_id:
+        if guess_memo is None:
+            guess_memo = {}
+        container_tag_id, target_type_tag_id = _guess_target_tag_id(value, guess_memo)
+        _write_header(write, container_tag_id, name, write_tag_id)
+        if container_tag_id == _TID_LIST:
             # Ordinary TAG_List
-            fp.write(target_type_tag_id.to_bytes(1, "big"))
-            fp.write(arrlen.to_bytes(4, "big"))
+            write(_S_LIST_HEADER.pack(target_type_tag_id, arrlen))
 
+            intsize = _get_intsize_by_tag_id(target_type_tag_id, False)
             for v in value:
-                _encode_value(fp, v, None, False, intsize=_get_intsize_by_tag_id(target_type_tag_id, False))
+                _encode_value(write, v, None, False, intsize=intsize, guess_memo=guess_memo)
         else:
             # Integer arrays
-            fp.write(arrlen.to_bytes(4, "big"))
+            write(_S_UINT.pack(arrlen))
+            intsize = _get_intsize_by_tag_id(container_tag_id, True)
             for v in value:
-                _encode_value(fp, v, None, False, intsize=_get_intsize_by_tag_id(container_tag_id, True))
+                _encode_value(write, v, None, False, intsize=intsize, guess_memo=guess_memo)
 
     elif isinstance(value, collections.abc.Mapping):
         # Dictionary, which means compound.
-        if write_tag_id:
-            fp.write(TagCompound.tag_id.to_bytes(1, "big"))
-        if name is not None:
-            _write_vlstring(fp, name)
+        _write_header(write, _TID_COMPOUND, name, write_tag_id)
 
         for k, v in value.items():
-            _encode_value(fp, v, k, True)
+            _encode_value(write, v, k, True, guess_memo=guess_memo)
 
-        fp.write(TagEnd.tag_id.to_bytes(1, "big"))
+        write(_TID_END_BYTE)
     else:
         raise TypeError(f"unknown type to encode '{value.__class__.__name__}'")
 
 
-def _encode_value(fp: _SupportsByteWrite, value: Any, name: str | None, write_tag_id: bool, *, intsize: int = 0):
+def _encode_value(
+    write: _ByteWriter,
+    value: Any,
+    name: str | None,
+    write_tag_id: bool,
+    *,
+    intsize: int = 0,
+    guess_memo: _GuessMemo | None = None,
+):
     if isinstance(value, Tag):
-        _encode_value_tagged(fp, value, write_tag_id)
+        _encode_value_tagged(write, value, write_tag_id)
     else:
-        _encode_value_primitive(fp, value, name, write_tag_id, intsize=intsize)
+        _encode_value_primitive(write, value, name, write_tag_id, intsize=intsize, guess_memo=guess_memo)
+
+
+def _get_convert_map(preserve_tag_type: bool, byte_array_as_bytes: bool) -> _ConvertMap:
+    if preserve_tag_type:
+        return _DECODER_BY_TAG_TYPE
+    return _DECODER_DUMMY_TYPE if byte_array_as_bytes else _DECODER_DUMMY_BYTEARRAY_AS_LIST_TYPE
 
 
 def load(
@@ -689,33 +1175,37 @@ def load(
     root_has_name: bool = True,
     byte_array_as_bytes: bool = True,
 ) -> Any:
-    convert_map = (
-        _DECODER_BY_TAG_TYPE
-        if preserve_tag_type
-        else (_DECODER_DUMMY_TYPE if byte_array_as_bytes else _DECODER_DUMMY_BYTEARRAY_AS_LIST_TYPE)
-    )
-    return _decode(fp, convert_map, root_has_name)[0]
+    convert_map = _get_convert_map(preserve_tag_type, byte_array_as_bytes)
+
+    if isinstance(fp, io.BytesIO):
+        # In-memory stream: walk its buffer by offset instead of issuing a read for every field
+        with fp.getbuffer() as view:
+            result, offset = _decode_buffer(view, fp.tell(), convert_map, root_has_name)
+        fp.seek(offset)
+        return result
+
+    return _decode(fp, convert_map, root_has_name)
 
 
 def loads(
     s: bytes, *, preserve_tag_type: bool = False, root_has_name: bool = True, byte_array_as_bytes: bool = True
 ) -> Any:
-    with io.BytesIO(s) as fp:
-        return load(
-            fp,
-            preserve_tag_type=preserve_tag_type,
-            root_has_name=root_has_name,
-            byte_array_as_bytes=byte_array_as_bytes,
-        )
+    convert_map = _get_convert_map(preserve_tag_type, byte_array_as_bytes)
+    with memoryview(s) as view:
+        return _decode_buffer(view.cast("B"), 0, convert_map, root_has_name)[0]
 
 
-def dump(obj: Any, fp: _SupportsByteWrite, *, root_name: str | None = "") -> None:
+def _dump(obj: Any, write: _ByteWriter, root_name: str | None):
     if isinstance(obj, Tag):
         root_name = obj.tag_name
-    _encode_value(fp, obj, root_name, True)
+    _encode_value(write, obj, root_name, True)
+
+
+def dump(obj: Any, fp: _SupportsByteWrite, *, root_name: str | None = "") -> None:
+    _dump(obj, fp.write, root_name)
 
 
 def dumps(obj: Any, *, root_name: str | None = "") -> bytes:
-    with io.BytesIO() as f:
-        dump(obj, f, root_name=root_name)
-        return f.getvalue()
+    buffer = bytearray()
+    _dump(obj, buffer.extend, root_name)
+    return bytes(buffer)
@@ -0,0 +1,219 @@
+import io
+import struct
+import unittest
+from collections.abc import Sequence
+
+import snakenbt
+
+
+class _Rows(Sequence):
+    # Produces a fresh list on every access, so the list's id() can be reused once it's freed.
+    def __init__(self, *rows):
+        self._rows = rows
+
+    def __getitem__(self, index):
+        return list(self._rows[index])
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def _untag(value):
+    # Primitive tags compare by identity, so compare their values instead
+    if isinstance(value, snakenbt.TagCompound):
+        return {k: _untag(v) for k, v in value.items()}
+    elif isinstance(value, (snakenbt.TagList, snakenbt.TagByteArray, snakenbt.TagIntArray, snakenbt.TagLongArray)):
+        return [_untag(v) for v in value]
+    elif isinstance(value, snakenbt.Tag):
+        return value.tag_value
+    return value
+
+
+class RoundTripTest(unittest.TestCase):
+    def roundtrip(self, obj, **kwargs):
+        encoded = snakenbt.dumps(obj)
+        decoded = snakenbt.loads(encoded, **kwargs)
+        # Stream decoding must agree with buffer decoding. load() walks the buffer of a plain BytesIO, so wrap it.
+        self.assertEqual(_untag(snakenbt.load(io.BufferedReader(io.BytesIO(encoded)), **kwargs)), _untag(decoded))
+        self.assertEqual(_untag(snakenbt.load(io.BytesIO(encoded), **kwargs)), _untag(decoded))
+        if kwargs.get("preserve_tag_type"):
+            self.assertEqual(snakenbt.dumps(decoded), encoded)
+        return decoded
+
+    def test_primitives(self):
+        data = {
+            "byte": 127,
+            "short": 32767,
+            "int": -2147483648,
+            "long": 9223372036854775807,
+            "double": 1.5,
+            "string": "snake\0é\U0001f40d",
+            "bytes": b"\x00\x01\xff",
+            "empty": {},
+        }
+        self.assertEqual(self.roundtrip(data), data)
+
+    def test_negative_ints_in_lists(self):
+        for value in ([-200, 5], [-129], [-128, 127], [256], [-40000, 1], [-(2**31) - 5], [-(2**63), 2**63 - 1]):
+            with self.subTest(value=value):
+                # TAG_Byte payloads are decoded unsigned unless the tag types are preserved
+                decoded = self.roundtrip({"a": value}, preserve_tag_type=True)
+                self.assertEqual(_untag(decoded["a"]), value)
+
+    def test_byte_arrays(self):
+        # Signed and unsigned byte values, and binary buffers, are all TAG_Byte_Array
+        for value in (b"\x00\xc8\xff", bytearray(b"\xff"), memoryview(b"\x01\xff"), [0, 200, 255], [-128, 255]):
+            with self.subTest(value=value):
+                encoded = snakenbt.dumps({"a": value})
+                self.assertEqual(encoded[3], snakenbt.TagByteArray.tag_id)
+                self.assertEqual(self.roundtrip({"a": value}), {"a": bytes(v & 0xFF for v in value)})
+
+    def test_byte_array_as_list_roundtrip(self):
+        encoded = snakenbt.dumps({"a": b"\x00\xc8\xff"})
+        decoded = snakenbt.loads(encoded, byte_array_as_bytes=False)
+        self.assertEqual(decoded, {"a": [0, 200, 255]})
+        self.assertEqual(snakenbt.dumps(decoded), encoded)
+
+    def test_list_int_too_large(self):
+        for value in ([2**63], [-(2**63) - 1]):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    snakenbt.dumps({"a": value})
+
+    def test_truncated_arrays(self):
+        # TAG_Int_Array, TAG_Long_Array and TAG_List<TAG_Int> claiming more elements than present
+        for encoded in (
+            b"\x0b\x00\x00\x00\x00\x00\x04" + b"\x00\x00\x00\x01" * 2,
+            b"\x0c\x00\x00\x00\x00\x00\x02" + b"\x00" * 8,
+            b"\x09\x00\x00\x03\x00\x00\x00\x03" + b"\x00" * 8,
+        ):
+            with self.subTest(encoded=encoded):
+                with self.assertRaises(struct.error):
+                    snakenbt.loads(encoded)
+                with self.assertRaises(struct.error):
+                    snakenbt.load(io.BufferedReader(io.BytesIO(encoded)))
+
+    def test_nested_lists(self):
+        data = {"l": [[1.5, 2.5], [3.5]], "s": [["a", "b"], []], "c": [{"x": 1}, {"x": 2}]}
+        self.assertEqual(self.roundtrip(data), data)
+
+    def test_nested_sequence_temporaries(self):
+        # Each row is a new object inferred and encoded separately; they must not share a cached type.
+        decoded = self.roundtrip({"l": _Rows((1.5, 2.5), (300, 2))})
+        self.assertEqual(decoded, {"l": [[1.5, 2.5], [300, 2]]})
+
+    def test_preserved_tag_types(self):
+        data = snakenbt.TagCompound(
+            {
+                "b": snakenbt.TagByte(-1),
+                "s": snakenbt.TagShort(2),
+                "i": snakenbt.TagInt(-3),
+                "l": snakenbt.TagLong(4),
+                "f": snakenbt.TagFloat(0.5),
+                "d": snakenbt.TagDouble(-0.25),
+                "str": snakenbt.TagString("x"),
+                "ba": snakenbt.TagByteArray([-128, 0, 127]),
+                "ia": snakenbt.TagIntArray([-(2**31), 2**31 - 1]),
+                "la": snakenbt.TagLongArray([-(2**63), 2**63 - 1]),
+                "list": snakenbt.TagList([snakenbt.TagShort(1), snakenbt.TagShort(-1)], cls=snakenbt.TagShort),
+                "empty": snakenbt.TagList(),
+            },
+            name="",
+        )
+        decoded = self.roundtrip(data, preserve_tag_type=True)
+        self.assertIsInstance(decoded, snakenbt.TagCompound)
+        self.assertEqual(decoded.keys(), data.keys())
+        for key, tag in data.items():
+            with self.subTest(key=key):
+                self.assertIs(type(decoded[key]), type(tag))
+                self.assertEqual(_untag(decoded[key]), _untag(tag))
+                self.assertEqual(decoded[key].tag_name, key)
+        self.assertIs(decoded["list"].tag_type, snakenbt.TagShort)
+
+    def test_tag_list_value_type(self):
+        tag = snakenbt.TagList([snakenbt.TagShort(1)], cls=snakenbt.TagShort)
+        with self.assertRaises(ValueError):
+            tag.tag_value = [1, 2]
+        with self.assertRaises(ValueError):
+            tag.tag_value = [snakenbt.TagInt(1)]
+        self.assertEqual(_untag(tag), [1])
+
+        values = [snakenbt.TagShort(2), snakenbt.TagShort(3)]
+        tag.tag_value = iter(values)
+        self.assertEqual(tag.tag_value, values)
+
+    def test_root_name(self):
+        decoded = snakenbt.loads(snakenbt.dumps({"a": 1}, root_name="root"), preserve_tag_type=True)
+        self.assertEqual(decoded.tag_name, "root")
+
+
+
+class _MyInt(snakenbt.TagInt):
+    pass
+
+
+class EncodeTaggedTest(unittest.TestCase):
+    def test_rename_after_dump(self):
+        child = snakenbt.TagInt(1)
+        root = snakenbt.TagCompound({"x": child}, name="a")
+        expected = snakenbt.TagCompound({"x": snakenbt.TagInt(1)}, name="a")
+        self.assertEqual(snakenbt.dumps(root), snakenbt.dumps(expected))
+
+        root.tag_name = "b"
+        del root["x"]
+        root["y"] = child
+        expected = snakenbt.TagCompound({"y": snakenbt.TagInt(1)}, name="b")
+        self.assertEqual(snakenbt.dumps(root), snakenbt.dumps(expected))
+
+        decoded = snakenbt.loads(snakenbt.dumps(root), preserve_tag_type=True)
+        self.assertEqual(decoded.tag_name, "b")
+        self.assertEqual(list(decoded.keys()), ["y"])
+        self.assertEqual(decoded["y"].tag_name, "y")
+
+    def test_shared_child_between_list_and_compound(self):
+        child = snakenbt.TagShort(5)
+        compound = snakenbt.TagCompound({"k": child}, name="")
+        tag_list = snakenbt.TagList([child], cls=snakenbt.TagShort)
+        root = snakenbt.TagCompound({"c": compound, "l": tag_list}, name="")
+
+        expected = snakenbt.dumps(
+            snakenbt.TagCompound(
+                {
+                    "c": snakenbt.TagCompound({"k": snakenbt.TagShort(5)}),
+                    "l": snakenbt.TagList([snakenbt.TagShort(5)], cls=snakenbt.TagShort),
+                },
+                name="",
+            )
+        )
+        # Dump twice so the second pass runs with the headers cached by the first
+        self.assertEqual(snakenbt.dumps(root), expected)
+        self.assertEqual(snakenbt.dumps(root), expected)
+        # The list pass reset the child's name; dumping the compound (now named "c") alone must write it again
+        self.assertEqual(
+            snakenbt.dumps(compound), snakenbt.dumps(snakenbt.TagCompound({"k": snakenbt.TagShort(5)}, name="c"))
+        )
+
+        # Moving the child under another key must not reuse the header cached for "k"
+        moved = snakenbt.TagCompound({"m": tag_list.pop()}, name="")
+        expected = snakenbt.dumps(snakenbt.TagCompound({"m": snakenbt.TagShort(5)}, name=""))
+        self.assertEqual(snakenbt.dumps(moved), expected)
+
+    def test_tag_subclass(self):
+        data = snakenbt.TagCompound({"v": _MyInt(7), "l": snakenbt.TagList([_MyInt(8)], cls=_MyInt)}, name="")
+        expected = snakenbt.TagCompound(
+            {"v": snakenbt.TagInt(7), "l": snakenbt.TagList([snakenbt.TagInt(8)], cls=snakenbt.TagInt)}, name=""
+        )
+        self.assertEqual(snakenbt.dumps(data), snakenbt.dumps(expected))
+        self.assertEqual(snakenbt.loads(snakenbt.dumps(data)), {"v": 7, "l": [8]})
+
+
+class LoadsInputTest(unittest.TestCase):
+    def test_buffer_types(self):
+        data = {"b": b"\x01\xff", "i": [1, 2**20], "s": "x", "c": {"n": 1.5}}
+        encoded = snakenbt.dumps(data)
+        for buffer in (bytearray(encoded), memoryview(encoded), memoryview(b"pad" + encoded)[3:]):
+            with self.subTest(buffer=type(buffer)):
+                self.assertEqual(snakenbt.loads(buffer), data)
+
+if __name__ == "__main__":
+    unittest.main()